@@ -1,8 +1,8 @@
 # -*-coding:utf-8-*
-import json
 import logging
 from typing import List
 
+from ._json import _dumps
 from .claim import Claim
 from .form import Form
 from .language import Language
@@ -10,6 +10,14 @@ from .lexeme import Lexeme
 from .sense import Sense
 from .wikidatasession import WikidataSession
 
+# Constant part of the parameters used by search_lexemes()
+_SEARCH_PARAMS = {
+    "action": "wbsearchentities",
+    "type": "lexeme",
+    "format": "json",
+    "limit": "10",
+}
+
 
 def get_or_create_lexeme(
     repo: WikidataSession, lemma: str, lang: Language, catLex: str
@@ -57,19 +65,7 @@ def search_lexemes(
     """
     # the language we specify in search is currently not used by the search
     # set it nevertheless, except if it is a Language without ISO code
-    if lang.short[:3] == "mis":
-        searchlang = "en"
-    else:
-        searchlang = lang.short
-
-    PARAMS = {
-        "action": "wbsearchentities",
-        "language": searchlang,
-        "type": "lexeme",
-        "search": lemma,
-        "format": "json",
-        "limit": "10",
-    }
+    PARAMS = {**_SEARCH_PARAMS, "language": lang.searchlang, "search": lemma}
 
     DATA = repo.get(PARAMS)
 
@@ -79,17 +75,19 @@ def search_lexemes(
     # Iterate over all results and check for matches. Do not rely on
     # match-results, since they can differ for smaller languages – use them
     # however to avoid unnecessary queries.
+    candidates = [item for item in DATA["search"] if item["label"] == lemma]
+    ids = [
+        item["id"]
+        for item in candidates
+        if item["match"].get("language", lang.short) in (lang.short, "und")
+    ]
+
+    # Fetch all candidates at once instead of one request per lexeme
     lexemes = []
-    for item in DATA["search"]:
-        if item["label"] == lemma:
-            if "language" in item["match"]:
-                if item["match"]["language"] != lang.short and item["match"] != "und":
-                    continue
-            idLex = item["id"]
-            lexeme = Lexeme(repo, idLex)
-            if lexeme["language"] == lang.qid and lexeme["lexicalCategory"] == catLex:
-                logging.info("Found lexeme: %s", idLex)
-                lexemes.append(lexeme)
+    for lexeme in Lexeme.many(repo, ids):
+        if lexeme["language"] == lang.qid and lexeme["lexicalCategory"] == catLex:
+            logging.info("Found lexeme: %s", lexeme.id)
+            lexemes.append(lexeme)
     return lexemes
 
 
@@ -113,7 +111,7 @@ def create_lexeme(
     """
 
     # Create the json with the lexeme's data
-    data_lex = json.dumps(
+    data_lex = _dumps(
         {
             "type": "lexeme",
             "lemmas": {lang.short: {"value": lemma, "language": lang.short}},
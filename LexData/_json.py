@@ -0,0 +1,20 @@
+"""
+Thin JSON compatibility layer: use orjson if it is installed, otherwise fall
+back to the json module of the standard library.
+"""
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    import json
+
+    _loads = json.loads
+    _dumps = json.dumps
+else:
+    # orjson parses bytes directly, so the response body can be passed as is
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        # The MediaWiki-API expects form-encoded text, therefore return str
+        return orjson.dumps(obj).decode()
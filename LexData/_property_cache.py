@@ -0,0 +1,79 @@
+"""
+Persistent cache of the datatypes of properties.
+
+Datatypes of properties practically never change, so they are stored in
+$XDG_CACHE_HOME/LexData/property_types.json (usually ~/.cache/LexData) and
+reused by later runs. They are kept separately for each wiki, by the URL of
+its API. The cache is only an optimization: if the file can't be read or
+written, it is ignored. Setting the environment variable LEXDATA_NO_CACHE
+disables it.
+"""
+import logging
+import os
+import tempfile
+from typing import Dict
+
+from ._json import _dumps, _loads
+
+
+def _disabled() -> bool:
+    return bool(os.environ.get("LEXDATA_NO_CACHE"))
+
+
+def _cacheFile() -> str:
+    cacheHome = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cacheHome, "LexData", "property_types.json")
+
+
+def load() -> Dict[str, Dict[str, str]]:
+    """
+    Read the cached datatypes, returns an empty dict if there are none.
+
+    Malformed entries are skipped.
+
+    :returns: Mappings of property ids to their datatypes by URL of the API
+    :rtype: Dict[str, Dict[str, str]]
+    """
+    if _disabled():
+        return {}
+    try:
+        with open(_cacheFile(), "rb") as f:
+            data = _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        url: {pid: t for pid, t in types.items() if isinstance(t, str)}
+        for url, types in data.items()
+        if isinstance(types, dict)
+    }
+
+
+def store(propertyTypes: Dict[str, Dict[str, str]]):
+    """
+    Write the datatypes to the cache file.
+
+    The file is replaced atomically, so concurrent runs never see a
+    partially written file.
+
+    :param propertyTypes: Mappings of property ids to their datatypes by URL
+                          of the API
+    """
+    if _disabled():
+        return
+    path = _cacheFile()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(_dumps(propertyTypes))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as error:
+        logging.debug("Could not write property type cache: %s", error)
@@ -0,0 +1,22 @@
+"""
+Retry policy of the connections of WikidataSession.
+"""
+from urllib3.util.retry import Retry
+
+
+class WriteSafeRetry(Retry):
+    """Retry transient errors, without ever repeating an edit.
+
+    Idempotent requests (GET) are retried on server errors and dropped
+    connections. POST requests can't be repeated safely: the edit might
+    already be saved, even if the answer got lost, and a second attempt
+    would then create a duplicate. Therefore they are only retried if the
+    server answered 429 (too many requests), which means that the request
+    wasn't processed. Lagged servers (maxlag) are handled by
+    WikidataSession.post() itself.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == "POST":
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
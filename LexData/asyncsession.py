@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from ._json import _loads
+from .utils import _cachedPropertyTypes, _propertyTypesQueries, _storePropertyTypes
+from .version import user_agent
+from .wikidatasession import _CSRF_TOKEN_PARAMS, _LOGIN_TOKEN_PARAMS
+
+
+class AsyncWikidataSession:
+    """Asynchronous variant of WikidataSession, based on aiohttp.
+
+    It allows to send many independent requests concurrently, for example
+    to load lots of entities. aiohttp has to be installed for this. The
+    session has to be used as asynchronous context manager::
+
+        async with AsyncWikidataSession() as repo:
+            results = await asyncio.gather(*(repo.get(p) for p in queries))
+    """
+
+    URL: str = "https://www.wikidata.org/w/api.php"
+    assertUser: Optional[str] = None
+    maxlag: int = 5
+    # Number of attempts of a request, if the servers are lagged
+    maxlagRetries: int = 10
+    # Maximal number of requests running at the same time
+    concurrency: int = 64
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        token: Optional[str] = None,
+        user_agent: str = user_agent,
+    ):
+        """
+        Prepare a session, the login happens when entering the context
+        """
+        self.username = username
+        self.password = password
+        self.headers = {"User-Agent": user_agent}
+        self.S: Any = None
+        if token is not None:
+            self.CSRF_TOKEN = token
+
+    async def __aenter__(self) -> "AsyncWikidataSession":
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("AsyncWikidataSession requires aiohttp") from None
+
+        connector = aiohttp.TCPConnector(limit_per_host=self.concurrency)
+        self.S = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        if self.username is not None and self.password is not None:
+            # Since logins don't put load on the servers
+            # we set maxlag higher for these requests.
+            self.maxlag = 30
+            try:
+                await self.login()
+            except BaseException:
+                # __aexit__ is not called if entering the context fails
+                await self.close()
+                raise
+            finally:
+                self.maxlag = 5
+        # After login enable 'assertUser'-feature of the Mediawiki-API to
+        # make sure to never edit accidentally as IP
+        if self.username is not None:
+            # truncate bot name if a "bot password" is used
+            self.assertUser = self.username.split("@")[0]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self.S is not None:
+            await self.S.close()
+            self.S = None
+
+    async def login(self):
+        # Ask for a token
+        DATA = await self.get(_LOGIN_TOKEN_PARAMS)
+        LOGIN_TOKEN = DATA["query"]["tokens"]["logintoken"]
+
+        # connexion request
+        PARAMS_2 = {
+            "action": "login",
+            "lgname": self.username,
+            "lgpassword": self.password,
+            "format": "json",
+            "lgtoken": LOGIN_TOKEN,
+        }
+        DATA = await self.post(PARAMS_2)
+        if DATA.get("login", []).get("result") != "Success":
+            raise PermissionError("Login failed", DATA["login"]["reason"])
+        logging.info("Log in succeeded")
+
+        DATA = await self.get(_CSRF_TOKEN_PARAMS)
+        self.CSRF_TOKEN = DATA["query"]["tokens"]["csrftoken"]
+        logging.info("Got CSRF token: %s", self.CSRF_TOKEN)
+
+    async def post(self, data: Dict[str, str]) -> Any:
+        """Send data to wikidata by POST request. The CSRF token is automatically
+        filled in if __AUTO__ is given instead.
+
+        :param data: Parameters to send via POST
+        :type  data: Dict[str, str])
+        :returns: Answer form the server as Objekt
+        :rtype: Any
+
+        """
+        # Work on a copy, to leave the dict of the caller unchanged
+        data = {**data, "maxlag": str(self.maxlag)}
+        if data.get("token") == "__AUTO__":
+            data["token"] = self.CSRF_TOKEN
+        if self.assertUser is not None:
+            data.setdefault("assertuser", self.assertUser)
+        for attempt in range(1, self.maxlagRetries + 1):
+            async with self._semaphore:
+                async with self.S.post(self.URL, data=data) as R:
+                    body = await R.read()
+                    status = R.status
+                    retry_after = R.headers.get("retry-after", 5)
+            if status != 200:
+                raise Exception(f"POST was unsuccessfull ({status}): {body!r}")
+            DATA = _loads(body)
+            if "error" not in DATA:
+                logging.debug("Post request succeed")
+                return DATA
+            if DATA["error"]["code"] != "maxlag":
+                raise PermissionError("API returned error: " + str(DATA["error"]))
+            if attempt == self.maxlagRetries:
+                # Don't wait, if there is no further attempt
+                break
+            sleepfor = float(retry_after)
+            logging.info("Maxlag hit, waiting for %.1f seconds", sleepfor)
+            await asyncio.sleep(sleepfor)
+        raise TimeoutError("Maxlag retries exhausted")
+
+    async def get(self, data: Dict[str, str]) -> Any:
+        """Send a GET request to wikidata
+
+        :param data: Parameters to send via GET
+        :type  data: Dict[str, str]
+        :returns: Answer form the server as Objekt
+        :rtype: Any
+
+        """
+        for attempt in range(1, self.maxlagRetries + 1):
+            async with self._semaphore:
+                async with self.S.get(self.URL, params=data) as R:
+                    body = await R.read()
+                    status = R.status
+                    retry_after = R.headers.get("retry-after", 5)
+            DATA = _loads(body)
+            if status == 200 and "error" not in DATA:
+                logging.debug("Get request succeed")
+                return DATA
+            # We do not set maxlag for GET requests – so this error can only
+            # occur if the users sets maxlag in the request data object
+            if DATA.get("error", {}).get("code") != "maxlag":
+                raise Exception(f"GET was unsuccessfull ({status}): {body!r}")
+            if attempt == self.maxlagRetries:
+                # Don't wait, if there is no further attempt
+                break
+            sleepfor = float(retry_after)
+            logging.info("Maxlag hit, waiting for %.1f seconds", sleepfor)
+            await asyncio.sleep(sleepfor)
+        raise TimeoutError("Maxlag retries exhausted")
+
+    async def getPropertyTypes(self, propertyIds: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the datatypes of multiple properties, with concurrent requests of
+        up to 50 properties each.
+
+        The results are also stored in the cache used by buildSnak() and
+        Claim(), so creating claims of these properties needs no requests,
+        as long as WikidataSession uses the same URL.
+
+        :param propertyIds: ids of the properties (example: ["P31", "P5137"])
+        :returns: Mapping of the property ids to their datatypes
+        :rtype: Dict[str, str]
+        """
+        ids = list(dict.fromkeys(propertyIds))
+        queries = _propertyTypesQueries(self.URL, ids)
+        if queries:
+            results = await asyncio.gather(*(self.get(q) for q in queries))
+            _storePropertyTypes(self.URL, results)
+        return _cachedPropertyTypes(self.URL, ids)
@@ -1,7 +1,21 @@
+from operator import itemgetter
 from typing import Any, Dict, Optional, Tuple, Union
 
 from .utils import buildSnak
 
+_RANK = {"normal": 0, "preferred": 1, "deprecated": -1}
+
+# Functions to extract the 'pure' value of a claim, by datatype
+_PURE = {
+    "wikibase-entityid": itemgetter("id"),
+    "string": lambda v: v,
+    "external-id": lambda v: v,
+    "monolingualtext": itemgetter("text"),
+    "quantity": lambda v: float(v["amount"]),
+    "time": itemgetter("time"),
+    "globecoordinate": lambda v: (float(v["latitude"]), float(v["longitude"])),
+}
+
 
 class Claim(dict):
     """Wrapper around a dict to represent a Claim
@@ -18,6 +32,10 @@ class Claim(dict):
     by use of the low level API call Lexeme.update_from_json().
     """
 
+    # Claims store all their data in the dict itself, so they need no
+    # per-instance __dict__. This makes them considerably smaller.
+    __slots__ = ()
+
     # Hack needed to define a property called property
     property_decorator = property
 
@@ -81,13 +99,11 @@ class Claim(dict):
 
         :rtype: int
         """
-        if self.rank == "normal":
-            return 0
-        elif self.rank == "preferred":
-            return 1
-        elif self.rank == "deprecated":
-            return -1
-        raise NotImplementedError("Unknown or invalid rank {}".format(self.rank))
+        rank = self["rank"]
+        try:
+            return _RANK[rank]
+        except KeyError:
+            raise NotImplementedError(f"Unknown or invalid rank {rank}") from None
 
     @property_decorator
     def pure_value(self) -> Union[str, int, float, Tuple[float, float]]:
@@ -104,26 +120,15 @@ class Claim(dict):
         Be aware that for most types this is not the full information stored in
         the value.
         """
-        value = self.value
-        vtype = self.type
-        if vtype == "wikibase-entityid":
-            return value["id"]
-        if vtype == "string":
-            return value
-        if vtype == "external-id":
-            return value
-        if vtype == "monolingualtext":
-            return value["text"]
-        if vtype == "quantity":
-            return float(value["amount"])
-        if vtype == "time":
-            return value["time"]
-        if vtype == "globecoordinate":
-            return (float(value["latitude"]), float(value["longitude"]))
-        raise NotImplementedError
+        mainsnak = self["mainsnak"]
+        try:
+            extract = _PURE[mainsnak["datatype"]]
+        except KeyError:
+            raise NotImplementedError from None
+        return extract(mainsnak["datavalue"]["value"])
 
     def __repr__(self) -> str:
         if "id" in self:
-            return "<Claim '{}'>".format(repr(self.value))
+            return f"<Claim '{self.value!r}'>"
         else:
-            return "<Detached Claim '{}'>".format(repr(self.value))
+            return f"<Detached Claim '{self.value!r}'>"
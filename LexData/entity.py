@@ -1,11 +1,39 @@
-import json
 import logging
-from typing import Dict, List, Union
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
 
+from ._json import _dumps
 from .claim import Claim
-from .utils import getPropertyType
+from .utils import buildSnak, getPropertyType, prefetchPropertyTypes
 from .wikidatasession import WikidataSession
 
+# Prefixes of the ids of the entities, that can be used as claim values
+_ENTITY_PREFIXES = ("Q", "P", "L")
+
+# Serializers for raw claim values by datatype of the property, values of
+# other datatypes are expected to be json-encoded already
+_SERIALIZERS = {"external-id": _dumps}
+
+
+def _entityDatatype(idStr: str) -> Optional[str]:
+    """
+    Guess the datatype of a property from the id of a value.
+
+    :param idStr: id of the entity (example: "L7-F1")
+    :returns: the datatype or None for invalid ids
+    """
+    if idStr.startswith("Q"):
+        return "wikibase-item"
+    if idStr.startswith("P"):
+        return "wikibase-property"
+    if idStr.startswith("L"):
+        if "-F" in idStr:
+            return "wikibase-form"
+        if "-S" in idStr:
+            return "wikibase-sense"
+        return "wikibase-lexeme"
+    return None
+
 
 class Entity(dict):
     """
@@ -13,15 +41,28 @@ class Entity(dict):
     Not yet implemented: Item, Property.
     """
 
+    # Names of the cached properties, that have to be reset when the
+    # underlying data changes
+    _cachedProperties = ("claims",)
+
     def __init__(self, repo: WikidataSession):
         super().__init__()
         self.repo = repo
 
-    @property
+    def _clearCache(self):
+        """
+        Discard all cached properties, they are recreated on next access.
+        """
+        for name in self._cachedProperties:
+            self.__dict__.pop(name, None)
+
+    @cached_property
     def claims(self) -> Dict[str, List[Claim]]:
         """
         All the claims of the Entity
 
+        The Claim objects are only created on first access and cached.
+
         :rtype: Dict[str, List[Claim]]
         """
         if self.get("claims", {}) != []:
@@ -29,7 +70,9 @@ class Entity(dict):
         else:
             return {}
 
-    def addClaims(self, claims: Union[List[Claim], Dict[str, List[str]]]):
+    def addClaims(
+        self, claims: Union[List[Claim], Tuple[Claim, ...], Dict[str, List[str]]]
+    ):
         """
         Add claims to the entity.
 
@@ -37,7 +80,7 @@ class Entity(dict):
 
                        There are two possibilities for this:
 
-                       - A list of Objects of type Claim
+                       - A list (or tuple) of Objects of type Claim
 
                          Example: ``[Claim(propertyId="P31", value="Q1")]``
 
@@ -49,7 +92,7 @@ class Entity(dict):
                        The first supports all datatypes, whereas the later
                        currently only supports datatypes of kind Entity.
         """
-        if isinstance(claims, list):
+        if isinstance(claims, (list, tuple)):
             self.__setClaims__(claims)
         elif isinstance(claims, dict):
             self.__createClaims__(claims)
@@ -60,11 +103,43 @@ class Entity(dict):
         """
         Add prebuild claims to the entity
 
+        All claims are uploaded together in a single wbeditentity request.
+
         :param claims: The list of claims to be added
         """
-        for claim in claims:
-            pid = claim.property
-            self.__setClaim__(pid, claim)
+        if not claims:
+            return
+        data = {
+            "claims": [
+                {
+                    "mainsnak": claim["mainsnak"],
+                    "type": "statement",
+                    "rank": claim.get("rank", "normal"),
+                }
+                for claim in claims
+            ]
+        }
+        PARAMS = {
+            "action": "wbeditentity",
+            "format": "json",
+            "bot": "1",
+            "id": self.id,
+            "token": "__AUTO__",
+            "data": _dumps(data),
+        }
+        DATA = self.repo.post(PARAMS)
+        logging.info("Claims added")
+        self.__refresh__(DATA)
+
+    def __refresh__(self, DATA: Dict):
+        """
+        Update the local claims after an edit with the entity returned by
+        wbeditentity.
+
+        :param DATA: The answer of the API to the edit
+        """
+        self["claims"] = DATA["entity"].get("claims", {})
+        self._clearCache()
 
     def __createClaims__(self, claims: Dict[str, List[str]]):
         """
@@ -73,57 +148,98 @@ class Entity(dict):
         Only properties of some entity type are implemented:
         Item, Property, Lexeme, Form and Sense
 
+        If more than one claim is given, all are uploaded in a single request.
+
         :param claims: The set of claims to be added
         """
-        for cle, values in claims.items():
-            for value in values:
-                self.__setEntityClaim__(cle, value)
+        pairs = [(cle, value) for cle, values in claims.items() for value in values]
+        # Get the datatypes of all properties at once instead of one by one
+        datatypes = prefetchPropertyTypes(claims.keys())
+        snaks = [self.__buildEntitySnak__(p, v, datatypes.get(p)) for p, v in pairs]
+        newClaims = [Claim({"mainsnak": s, "rank": "normal"}) for s in snaks]
+        if len(newClaims) == 1:
+            self.__setClaim__(newClaims[0].property, newClaims[0])
+        elif newClaims:
+            self.__setClaims__(newClaims)
 
-    def __setEntityClaim__(self, idProp: str, idStr: str):
+    def __buildEntitySnak__(
+        self, idProp: str, idStr: str, datatype: Optional[str] = None
+    ) -> Dict:
         """
-        Add a claim of an entity-type to the entity.
+        Build the snak of a claim given by the id of its value.
 
-        Supported types are Lexeme, Form, Sense, Item, Property.
+        Supported types are Lexeme, Form, Sense, Item, Property and external-ids.
 
         :param idProp: id of the property (example: "P31")
-        :param idItem: id of the entity (example: "Q1")
-        """
-        # Check if this is an external-id property
-        datatype = None
-        try:
-            datatype = getPropertyType(idProp)
-        except Exception:
-            # If we can't get the property type, assume it's an entity
-            pass
-        if datatype == "external-id":
-            # For external-id properties, create a Claim object and use __setClaims__
-            claim = Claim(propertyId=idProp, value=idStr)
-            self.__setClaims__([claim])
-            return
-        # Handle entity-type properties as before
-        if idStr.startswith(('Q', 'P', 'L')):
-            entityId = int(idStr[1:])
-            claim_value = json.dumps({"entity-type": "item", "numeric-id": entityId})
-            self.__setClaim__(idProp, claim_value)
-        else:
-            raise ValueError(f"Invalid entity ID format: {idStr}. Expected Q, P, or L prefix.")
+        :param idStr: id of the entity (example: "Q1")
+        :param datatype: the datatype of the property, looked up if not given
+        """
+        if datatype is None:
+            try:
+                datatype = getPropertyType(idProp)
+            except Exception:
+                # If we can't get the property type, derive it from the id
+                datatype = _entityDatatype(idStr)
+        if datatype is None or (
+            datatype.startswith("wikibase-") and not idStr.startswith(_ENTITY_PREFIXES)
+        ):
+            raise ValueError(
+                f"Invalid entity ID format: {idStr}. Expected Q, P, or L prefix."
+            )
+        return buildSnak(idProp, idStr, datatype)
+
+    async def addClaimsAsync(self, claims: List[Claim], concurrency: int = 8):
+        """
+        Add claims to the entity, using one concurrent request per claim.
+
+        Usually addClaims() is the better choice, since it uploads all claims
+        in a single request. This is an alternative for cases, in which
+        claims have to be created separately. Blocking requests are run in
+        threads, at most `concurrency` at the same time.
+
+        :param claims: The list of claims to be added
+        :param concurrency: The maximal number of simultaneous requests
+        """
+        # asyncio is imported here, since it is slow to import and only
+        # needed by this method
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def add(claim: Claim):
+            idProp = claim.property
+            async with semaphore:
+                addedclaim = await loop.run_in_executor(
+                    None, self.__postClaim__, idProp, claim
+                )
+            # Modify the local data only from the event loop, not the threads
+            self.__storeClaim__(idProp, addedclaim)
+
+        results = await asyncio.gather(
+            *(add(claim) for claim in claims), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
     def __setClaim__(self, idProp: str, claim_value):
-        from .utils import getPropertyType
-        import LexData.lexeme
-        is_lexeme = isinstance(self, LexData.lexeme.Lexeme)
+        addedclaim = self.__postClaim__(idProp, claim_value)
+        self.__storeClaim__(idProp, addedclaim)
+
+    def __postClaim__(self, idProp: str, claim_value) -> Dict:
+        """
+        Upload a single claim with wbcreateclaim.
+
+        :param idProp: id of the property (example: "P31")
+        :param claim_value: A Claim or the json-encoded value of the claim
+        :returns: The created claim as returned by the API
+        """
         if isinstance(claim_value, Claim):
-            datatype = getPropertyType(idProp)
-            if datatype == "external-id":
-                claim_value = claim_value.pure_value
-            else:
-                snak_data = claim_value["mainsnak"]
-                claim_value = json.dumps(snak_data["datavalue"])
-        datatype = getPropertyType(idProp)
-        if datatype == "external-id":
-            claim_value_json = json.dumps(claim_value)
+            claim_value_json = _dumps(claim_value["mainsnak"]["datavalue"]["value"])
         else:
-            claim_value_json = claim_value
+            serialize = _SERIALIZERS.get(getPropertyType(idProp))
+            claim_value_json = serialize(claim_value) if serialize else claim_value
         # Use wbcreateclaim for both lexemes and other entities
         PARAMS = {
             "action": "wbcreateclaim",
@@ -138,16 +254,23 @@ class Entity(dict):
 
         DATA = self.repo.post(PARAMS)
         assert "claim" in DATA
-        addedclaim = DATA["claim"]
         logging.info("Claim added")
+        return DATA["claim"]
 
-        # Add the created claim to the local entity instance
-        if self.get("claims", []) == []:
-            self["claims"] = {idProp: addedclaim}
-        elif idProp in self.claims:
-            self.claims[idProp].append(addedclaim)
+    def __storeClaim__(self, idProp: str, addedclaim: Dict):
+        """
+        Add a created claim to the local entity instance.
+        """
+        # The API returns an empty list instead of a dict if there are no claims
+        raw = self.get("claims")
+        if not raw:
+            self["claims"] = {idProp: [addedclaim]}
+        elif idProp in raw:
+            raw[idProp].append(addedclaim)
         else:
-            self.claims[idProp] = [addedclaim]
+            raw[idProp] = [addedclaim]
+        # The cached Claim objects are rebuilt on the next access
+        self._clearCache()
 
     @property
     def id(self) -> str:
@@ -18,7 +18,7 @@ class Form(Entity):
 
         :rtype: str
         """
-        return list(self["representations"].values())[0]["value"]
+        return next(iter(self["representations"].values()))["value"]
 
     def __repr__(self) -> str:
-        return "<Form '{}'>".format(self.form)
+        return f"<Form '{self.form}'>"
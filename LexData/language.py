@@ -2,16 +2,30 @@
 This module simply contains a few common Languages with their language-codes
 and QIDs for easier use.
 """
+import sys
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class Language:
     """Dataclass representing a language"""
 
+    # searchlang is the language used for searching, derived from short
+    __slots__ = ("short", "qid", "searchlang")
+
     short: str
     qid: str
 
+    def __post_init__(self):
+        object.__setattr__(self, "short", sys.intern(self.short))
+        # Languages without ISO code can't be used for searching
+        searchlang = "en" if self.short.startswith("mis") else self.short
+        object.__setattr__(self, "searchlang", searchlang)
+
+    def __reduce__(self):
+        # frozen instances with slots can't be restored attribute by attribute
+        return (type(self), (self.short, self.qid))
+
 
 # feel free to add more languages
 en = Language("en", "Q1860")
@@ -1,7 +1,8 @@
-import json
 import logging
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
 
+from ._json import _dumps
 from .claim import Claim
 from .entity import Entity
 from .form import Form
@@ -13,6 +14,8 @@ from .wikidatasession import WikidataSession
 class Lexeme(Entity):
     """Wrapper around a dict to represent a Lexeme"""
 
+    _cachedProperties = ("claims", "forms", "senses")
+
     def __init__(self, repo: WikidataSession, idLex: str):
         super().__init__(repo)
         self.getLex(idLex)
@@ -31,6 +34,48 @@ class Lexeme(Entity):
         DATA = self.repo.get(PARAMS)
 
         self.update(DATA["entities"][idLex])
+        self._clearCache()
+
+    @classmethod
+    def from_json(cls, repo: WikidataSession, data: Dict) -> "Lexeme":
+        """Create a Lexeme from already fetched data without querying the API.
+
+        :param repo: Wikidata Session
+        :type  repo: WikidataSession
+        :param data: The json-data of the lexeme as returned by wbgetentities
+        :type  data: Dict
+        :rtype: Lexeme
+        """
+        lexeme = cls.__new__(cls)
+        Entity.__init__(lexeme, repo)
+        lexeme.update(data)
+        return lexeme
+
+    @classmethod
+    def many(cls, repo: WikidataSession, ids: List[str]) -> List["Lexeme"]:
+        """Load multiple lexemes with as few requests as possible.
+
+        The API accepts up to 50 ids per request, larger lists are split.
+
+        :param repo: Wikidata Session
+        :type  repo: WikidataSession
+        :param ids: Lexeme identifiers (example: ["L2", "L3"])
+        :type  ids: List[str]
+        :returns: The lexemes in the order of the given ids
+        :rtype: List[Lexeme]
+        """
+        lexemes = []
+        for i in range(0, len(ids), 50):
+            chunk = ids[i : i + 50]
+            PARAMS = {
+                "action": "wbgetentities",
+                "format": "json",
+                "ids": "|".join(chunk),
+            }
+            DATA = repo.get(PARAMS)
+            for idLex in chunk:
+                lexemes.append(cls.from_json(repo, DATA["entities"][idLex]))
+        return lexemes
 
     @property
     def lemma(self) -> str:
@@ -39,7 +84,7 @@ class Lexeme(Entity):
 
         :rtype: str
         """
-        return list(self["lemmas"].values())[0]["value"]
+        return next(iter(self["lemmas"].values()))["value"]
 
     @property
     def language(self) -> str:
@@ -48,9 +93,9 @@ class Lexeme(Entity):
 
         :rtype: str
         """
-        return list(self["lemmas"].values())[0]["language"]
+        return next(iter(self["lemmas"].values()))["language"]
 
-    @property
+    @cached_property
     def forms(self) -> List[Form]:
         """
         List of all forms
@@ -59,7 +104,7 @@ class Lexeme(Entity):
         """
         return [Form(self.repo, f) for f in super().get("forms", [])]
 
-    @property
+    @cached_property
     def senses(self) -> List[Sense]:
         """
         List of all senses
@@ -90,7 +135,7 @@ class Lexeme(Entity):
             "lexemeId": self.id,
             "token": "__AUTO__",
             "bot": "1",
-            "data": json.dumps(data_sense),
+            "data": _dumps(data_sense),
         }
         DATA = self.repo.post(PARAMS)
         addedSense = Sense(self.repo, DATA["sense"])
@@ -103,6 +148,8 @@ class Lexeme(Entity):
 
         # Add the created form to the local lexeme
         self["senses"].append(addedSense)
+        if "senses" in self.__dict__:
+            self.senses.append(addedSense)
 
         return idSense
 
@@ -133,7 +180,7 @@ class Lexeme(Entity):
             languagename = language.short
 
         # Create the json with the forms's data
-        data_form = json.dumps(
+        data_form = _dumps(
             {
                 "representations": {
                     languagename: {"value": form, "language": languagename}
@@ -162,6 +209,8 @@ class Lexeme(Entity):
 
         # Add the created form to the local lexeme
         self["forms"].append(addedForm)
+        if "forms" in self.__dict__:
+            self.forms.append(addedForm)
 
         return idForm
 
@@ -180,10 +229,15 @@ class Lexeme(Entity):
         )
         self.__createClaims__(claims)
 
+    def __refresh__(self, DATA: Dict):
+        # Due to limitations of the API, the returned data cannot be used to
+        # update the instance. Therefore reload the lexeme.
+        self.getLex(self.id)
+
     def __repr__(self) -> str:
-        return "<Lexeme '{}'>".format(self.id)
+        return f"<Lexeme '{self.id}'>"
 
-    def update_from_json(self, data: str, overwrite=False):
+    def update_from_json(self, data: Union[str, Dict[str, Any]], overwrite=False):
         """Update the lexeme from an json-string.
 
         This is a lower level function usable to save arbitrary modifications
@@ -191,8 +245,11 @@ class Lexeme(Entity):
         user.
 
         :param data: Data update: See the API documentation about the format.
+                     Either as json-string or as dict, which is serialized.
         :param overwrite: If set the whole entity is replaced by the supplied data
         """
+        if not isinstance(data, str):
+            data = _dumps(data)
         PARAMS: Dict[str, str] = {
             "action": "wbeditentity",
             "format": "json",
@@ -20,12 +20,9 @@ class Sense(Entity):
         :type  lang: str
         :rtype: str
         """
-        if lang not in self["glosses"]:
-            if "en" in self["glosses"]:
-                lang = "en"
-            else:
-                lang = list(self["glosses"].keys())[0]
-        return self["glosses"][lang]["value"]
+        glosses = self["glosses"]
+        gloss = glosses.get(lang) or glosses.get("en") or next(iter(glosses.values()))
+        return gloss["value"]
 
     def __repr__(self) -> str:
-        return "<Sense '{}'>".format(self.glosse())
+        return f"<Sense '{self.glosse()}'>"
@@ -1,52 +1,143 @@
-import functools
-import json
+import logging
+import math
 from datetime import datetime
-from typing import Any, Dict
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-from .wikidatasession import WikidataSession
+from . import _property_cache
 
+# Cache of the datatypes of properties by the URL of the API of the wiki,
+# they are practically immutable. It is initialized with the datatypes
+# persisted by previous runs.
+_propertyTypes: Dict[str, Dict[str, str]] = _property_cache.load()
 
-@functools.lru_cache()
-def getPropertyType(propertyId: str):
-    repo = WikidataSession()
-    query = {
-        "action": "query",
-        "format": "json",
-        "prop": "revisions",
-        "titles": "Property:" + propertyId,
-        "rvprop": "content",
-    }
-    DATA = repo.get(query)
-    jsonstr = list(DATA["query"]["pages"].values())[0]["revisions"][0]["*"]
-    content = json.loads(jsonstr)
-    return content["datatype"]
+# Constant part of the parameters used to query datatypes of properties
+_PROPERTY_TYPES_PARAMS = {
+    "action": "wbgetentities",
+    "format": "json",
+    "props": "datatype",
+}
 
 
-def buildDataValue(datatype: str, value):
-    if datatype in [
+def getPropertyType(propertyId: str) -> str:
+    """
+    Get the datatype of a property of the wiki of WikidataSession.URL.
+
+    :param propertyId: id of the property (example: "P31")
+    :rtype: str
+    """
+    from .wikidatasession import WikidataSession
+
+    cached = _propertyTypes.get(WikidataSession.URL, {})
+    if propertyId in cached:
+        return cached[propertyId]
+    return getPropertyTypes([propertyId])[propertyId]
+
+
+def getPropertyTypes(propertyIds: Iterable[str]) -> Dict[str, str]:
+    """
+    Get the datatypes of multiple properties of the wiki of
+    WikidataSession.URL, with one request per 50 properties that are not
+    cached yet. Multiple requests are sent in parallel. Fetched datatypes are
+    also persisted on disk for later runs.
+
+    :param propertyIds: ids of the properties (example: ["P31", "P5137"])
+    :returns: Mapping of the property ids to their datatypes, properties that
+              don't exist are left out
+    :rtype: Dict[str, str]
+    """
+    from .wikidatasession import WikidataSession
+
+    url = WikidataSession.URL
+    ids = list(dict.fromkeys(propertyIds))
+    queries = _propertyTypesQueries(url, ids)
+    if queries:
+        repo = WikidataSession()
+        if len(queries) == 1:
+            results = [repo.get(queries[0])]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(len(queries), 16)) as executor:
+                results = list(executor.map(repo.get, queries))
+        # The cache is only modified here, not from the threads
+        _storePropertyTypes(url, results)
+    return _cachedPropertyTypes(url, ids)
+
+
+def _propertyTypesQueries(url: str, ids: List[str]) -> List[Dict[str, str]]:
+    """
+    Build the queries for the datatypes of the properties, that are not
+    cached yet. Each query asks for up to 50 properties.
+
+    :param url: URL of the API of the wiki
+    :param ids: ids of the properties without duplicates
+    :rtype: List[Dict[str, str]]
+    """
+    cached = _propertyTypes.get(url, {})
+    missing = [p for p in ids if p not in cached]
+    return [
+        {**_PROPERTY_TYPES_PARAMS, "ids": "|".join(missing[i : i + 50])}
+        for i in range(0, len(missing), 50)
+    ]
+
+
+def _storePropertyTypes(url: str, results: Iterable[Dict[str, Any]]):
+    """
+    Add the datatypes from the answers of the queries built by
+    _propertyTypesQueries() to the cache and persist it.
+
+    :param url: URL of the API of the wiki
+    :param results: The answers of the API
+    """
+    cached = _propertyTypes.setdefault(url, {})
+    for DATA in results:
+        for pid, entity in DATA["entities"].items():
+            if "datatype" in entity:
+                cached[pid] = entity["datatype"]
+    _property_cache.store(_propertyTypes)
+
+
+def _cachedPropertyTypes(url: str, ids: List[str]) -> Dict[str, str]:
+    """
+    Get the cached datatypes of the properties, uncached ones are left out.
+
+    :param url: URL of the API of the wiki
+    :rtype: Dict[str, str]
+    """
+    cached = _propertyTypes.get(url, {})
+    return {p: cached[p] for p in ids if p in cached}
+
+
+def prefetchPropertyTypes(propertyIds: Iterable[str]) -> Dict[str, str]:
+    """
+    Load the datatypes of multiple properties into the cache of
+    getPropertyType() using getPropertyTypes().
+
+    This is only an optimization: errors are logged and the datatypes are
+    then fetched one by one when needed.
+
+    :returns: The datatypes that could be loaded
+    :rtype: Dict[str, str]
+    """
+    try:
+        return getPropertyTypes(propertyIds)
+    except Exception as error:
+        logging.debug("Prefetching property types failed: %s", error)
+        return {}
+
+
+_ENTITY_TYPES = frozenset(
+    {
         "wikibase-lexeme",
         "wikibase-form",
         "wikibase-sense",
         "wikibase-item",
         "wikibase-property",
-    ]:
-        if type(value) == dict:
-            return {"value": value, "type": "wikibase-entity"}
-        elif type(value) == str:
-            value = {"entity-type": datatype[9:], "id": value}
-            return {"value": value, "type": "wikibase-entity"}
-        else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    elif datatype == "external-id":
-        if type(value) == str:
-            return {"value": value, "type": "external-id"}
-        else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    elif datatype in [
+    }
+)
+_STRING_TYPES = frozenset(
+    {
         "string",
         "tabular-data",
         "geo-shape",
@@ -54,66 +145,116 @@ def buildDataValue(datatype: str, value):
         "musical-notation",
         "math",
         "commonsMedia",
-    ]:
-        if type(value) == dict:
-            return {"value": value, "type": "string"}
-        elif type(value) == str:
-            return {"value": {"value": value}, "type": "string"}
-        else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    elif datatype == "monolingualtext":
-        if type(value) == dict:
-            return {"value": value, "type": "monolingualtext"}
-        else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    elif datatype == "globe-coordinate":
-        if type(value) == dict:
-            return {"value": value, "type": "globecoordinate"}
-        else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    elif datatype == "quantity":
-        if type(value) == dict:
-            return {"value": value, "type": "quantity"}
-        if type(value) in [int, float]:
-            valueObj = {
-                "amount": "%+f" % value,
-                "unit": "1",
-            }
-            return {"value": valueObj, "type": "time"}
-        else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    elif datatype == "time":
-        if type(value) == dict:
-            return {"value": value, "type": "time"}
-        if type(value) == datetime:
-            cleanedDateTime = value.replace(hour=0, minute=0, second=0, microsecond=0)
-            valueObj: Dict[str, Any] = {
-                "time": "+" + cleanedDateTime.isoformat() + "Z",
-                "timezone": 0,
-                "before": 0,
-                "after": 0,
-                "precision": 11,
-                "calendarmodel": "http://www.wikidata.org/entity/Q1985727",
-            }
-            return {"value": valueObj, "type": "time"}
+    }
+)
+
+# Constant part of the time values built from datetime objects
+_TIME_TEMPLATE = {
+    "timezone": 0,
+    "before": 0,
+    "after": 0,
+    "precision": 11,
+    "calendarmodel": "http://www.wikidata.org/entity/Q1985727",
+}
+
+
+def _typeError(datatype: str, value) -> TypeError:
+    return TypeError(f"Can not convert type {type(value)} to datatype {datatype}")
+
+
+def _entityValue(datatype: str, value):
+    if isinstance(value, dict):
+        return {"value": value, "type": "wikibase-entityid"}
+    if isinstance(value, str):
+        value = {"entity-type": datatype[9:], "id": value}
+        return {"value": value, "type": "wikibase-entityid"}
+    raise _typeError(datatype, value)
+
+
+def _externalIdValue(datatype: str, value):
+    if isinstance(value, str):
+        return {"value": value, "type": "string"}
+    raise _typeError(datatype, value)
+
+
+def _stringValue(datatype: str, value):
+    if isinstance(value, (dict, str)):
+        return {"value": value, "type": "string"}
+    raise _typeError(datatype, value)
+
+
+def _dictValue(valueType: str):
+    """Handler for datatypes, which only accept already built dicts"""
+
+    def handler(datatype: str, value):
+        if isinstance(value, dict):
+            return {"value": value, "type": valueType}
+        raise _typeError(datatype, value)
+
+    return handler
+
+
+def _quantityValue(datatype: str, value):
+    if isinstance(value, dict):
+        return {"value": value, "type": "quantity"}
+    # bool is a subclass of int, but True is no quantity
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Wikibase expects a decimal number without exponent. Integers are
+        # kept exact and floats are written with their shortest repr.
+        if isinstance(value, int):
+            amount = f"{value:+d}"
+        elif math.isfinite(value):
+            amount = f"{Decimal(repr(value)):+f}"
         else:
-            raise TypeError(
-                f"Can not convert type {type(value)} to datatype {datatype}"
-            )
-    else:
-        raise NotImplementedError(f"Datatype {datatype} not implemented")
+            raise ValueError(f"Quantities have to be finite, got {value}")
+        valueObj = {
+            "amount": amount,
+            "unit": "1",
+        }
+        return {"value": valueObj, "type": "quantity"}
+    raise _typeError(datatype, value)
+
+
+def _timeValue(datatype: str, value):
+    if isinstance(value, dict):
+        return {"value": value, "type": "time"}
+    if isinstance(value, datetime):
+        cleanedDateTime = value.replace(hour=0, minute=0, second=0, microsecond=0)
+        valueObj = {"time": "+" + cleanedDateTime.isoformat() + "Z", **_TIME_TEMPLATE}
+        return {"value": valueObj, "type": "time"}
+    raise _typeError(datatype, value)
+
+
+# Functions to build the datavalue of a snak, by datatype of the property
+_HANDLERS: Dict[str, Callable[[str, Any], Dict[str, Any]]] = {
+    **{datatype: _entityValue for datatype in _ENTITY_TYPES},
+    **{datatype: _stringValue for datatype in _STRING_TYPES},
+    "external-id": _externalIdValue,
+    "monolingualtext": _dictValue("monolingualtext"),
+    "globe-coordinate": _dictValue("globecoordinate"),
+    "quantity": _quantityValue,
+    "time": _timeValue,
+}
+
+
+def buildDataValue(datatype: str, value):
+    try:
+        handler = _HANDLERS[datatype]
+    except KeyError:
+        raise NotImplementedError(f"Datatype {datatype} not implemented") from None
+    return handler(datatype, value)
+
 
+def buildSnak(propertyId: str, value, datatype: Optional[str] = None):
+    """
+    Build the snak of a claim.
 
-def buildSnak(propertyId: str, value):
-    datatype = getPropertyType(propertyId)
+    :param propertyId: id of the property (example: "P31")
+    :param value: the value of the claim
+    :param datatype: the datatype of the property, looked up if not given
+    """
+    if datatype is None:
+        datatype = getPropertyType(propertyId)
     datavalue = buildDataValue(datatype, value)
     return {
         "snaktype": "value",
@@ -1,20 +1,47 @@
 import logging
+import os
 import time
 from typing import Any, Dict, Optional
 
-import requests
-
+from ._json import _loads
 from .version import user_agent
 
+# Payloads larger than this are sent as multipart/form-data, which saves
+# percent-encoding them (about 8 KiB, a lexeme with a handful of claims).
+_MULTIPART_THRESHOLD = 8 * 1024
+
+# Parameters of the requests for a login token and a CSRF token
+_LOGIN_TOKEN_PARAMS = {
+    "action": "query",
+    "meta": "tokens",
+    "type": "login",
+    "format": "json",
+}
+_CSRF_TOKEN_PARAMS = {"action": "query", "meta": "tokens", "format": "json"}
+
 
 class WikidataSession:
     """Wikidata network and authentication session. Needed for everything this
     framework does.
+
+    By default a requests.Session is used for the connections. Other HTTP
+    clients with a compatible API can be passed as session, for example a
+    requests_oauthlib.OAuth2Session or an httpx.Client with HTTP/2, which
+    multiplexes all requests over a single connection::
+
+        import httpx
+
+        client = httpx.Client(http2=True, limits=httpx.Limits(max_connections=64))
+        repo = WikidataSession(username, password, session=client)
     """
 
     URL: str = "https://www.wikidata.org/w/api.php"
     assertUser: Optional[str] = None
     maxlag: int = 5
+    # Number of attempts of a request, if the servers are lagged
+    maxlagRetries: int = 10
+    # Number of connections kept open for concurrent requests
+    poolSize: int = 64
 
     def __init__(
         self,
@@ -23,15 +50,49 @@ class WikidataSession:
         token: Optional[str] = None,
         auth: Optional[str] = None,
         user_agent: str = user_agent,
+        session: Optional[Any] = None,
     ):
         """
         Create a wikidata session by login in and getting the token
+
+        :param session: HTTP client to use instead of a new requests.Session
         """
+        # requests is imported here, since it is heavy and not needed by
+        # scripts that only work with already fetched data
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        from ._retry import WriteSafeRetry
+
         self.username = username
         self.password = password
         self.auth = auth
         self.headers = {"User-Agent": user_agent}
-        self.S = requests.Session()
+        if session is None:
+            session = requests.Session()
+            # Reuse connections and retry transient server errors with backoff,
+            # but never repeat edits that might already have been saved
+            retry = WriteSafeRetry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=self.poolSize, max_retries=retry
+            )
+            # also for http, since the URL can be pointed to other (local) wikis
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        # A given session keeps its own authentication, if none is passed
+        if self.auth is not None:
+            session.auth = self.auth
+        self.S = session
+        self.S.headers.update(self.headers)
+        # Settings read from the environment (proxies, certificates, netrc)
+        # per URL, the settings of the session itself are read on every call
+        self._environment: Dict[str, Dict[str, Any]] = {}
         if username is not None and password is not None:
             # Since logins don't put load on the servers
             # we set maxlag higher for these requests.
@@ -48,13 +109,7 @@ class WikidataSession:
 
     def login(self):
         # Ask for a token
-        PARAMS_1 = {
-            "action": "query",
-            "meta": "tokens",
-            "type": "login",
-            "format": "json",
-        }
-        DATA = self.get(PARAMS_1)
+        DATA = self.get(_LOGIN_TOKEN_PARAMS)
         LOGIN_TOKEN = DATA["query"]["tokens"]["logintoken"]
 
         # connexion request
@@ -70,11 +125,57 @@ class WikidataSession:
             raise PermissionError("Login failed", DATA["login"]["reason"])
         logging.info("Log in succeeded")
 
-        PARAMS_3 = {"action": "query", "meta": "tokens", "format": "json"}
-        DATA = self.get(PARAMS_3)
+        DATA = self.get(_CSRF_TOKEN_PARAMS)
         self.CSRF_TOKEN = DATA["query"]["tokens"]["csrftoken"]
         logging.info("Got CSRF token: %s", self.CSRF_TOKEN)
 
+    def _send(self, method: str, params=None, data=None, files=None):
+        """Prepare and send a request to the API.
+
+        Unlike requests.Session.request() this does not look up the settings
+        of the environment on every call, they are read only once per URL.
+        The settings of the session are applied the same way as by requests.
+        """
+        import requests
+        from requests.sessions import merge_setting
+
+        if type(self.S) is not requests.Session:
+            # Other HTTP clients are used through their public API. This
+            # includes subclasses of requests.Session, which often extend
+            # request(), for example to add OAuth tokens or caching.
+            return self.S.request(
+                method, self.URL, params=params, data=data, files=files
+            )
+        if not self.S.trust_env:
+            env: Dict[str, Any] = {"proxies": {}, "verify": None, "auth": None}
+        else:
+            env = self._environment.get(self.URL)
+            if env is None:
+                env = self._environment[self.URL] = {
+                    "proxies": requests.utils.get_environ_proxies(self.URL),
+                    "verify": os.environ.get("REQUESTS_CA_BUNDLE")
+                    or os.environ.get("CURL_CA_BUNDLE"),
+                    "auth": requests.utils.get_netrc_auth(self.URL),
+                }
+        # Settings from the environment take precedence, as in requests
+        settings = {
+            "proxies": merge_setting(env["proxies"], self.S.proxies),
+            "stream": self.S.stream,
+            "verify": merge_setting(env["verify"], self.S.verify),
+            "cert": self.S.cert,
+        }
+        auth = self.S.auth or env["auth"]
+
+        req = requests.PreparedRequest()
+        req.prepare_method(method)
+        req.prepare_url(self.URL, merge_setting(params, self.S.params))
+        req.prepare_headers(self.S.headers)
+        req.prepare_cookies(self.S.cookies)
+        req.prepare_body(data, files)
+        req.prepare_auth(auth, self.URL)
+        req.prepare_hooks(self.S.hooks)
+        return self.S.send(req, **settings)
+
     def post(self, data: Dict[str, str]) -> Any:
         """Send data to wikidata by POST request. The CSRF token is automatically
         filled in if __AUTO__ is given instead.
@@ -85,27 +186,37 @@ class WikidataSession:
         :rtype: Any
 
         """
+        # Work on a copy, to leave the dict of the caller unchanged
+        data = {**data, "maxlag": str(self.maxlag)}
         if data.get("token") == "__AUTO__":
             data["token"] = self.CSRF_TOKEN
-        if "assertuser" not in data and self.assertUser is not None:
-            data["assertuser"] = self.assertUser
-        data["maxlag"] = str(self.maxlag)
-        R = self.S.post(self.URL, data=data, headers=self.headers, auth=self.auth)
-        if R.status_code != 200:
-            raise Exception(
-                "POST was unsuccessfull ({}): {}".format(R.status_code, R.text)
-            )
-        DATA = R.json()
-        if "error" in DATA:
-            if DATA["error"]["code"] == "maxlag":
-                sleepfor = float(R.headers.get("retry-after", 5))
-                logging.info("Maxlag hit, waiting for %.1f seconds", sleepfor)
-                time.sleep(sleepfor)
-                return self.post(data)
-            else:
+        if self.assertUser is not None:
+            data.setdefault("assertuser", self.assertUser)
+        payload = data.get("data")
+        if isinstance(payload, str) and len(payload) > _MULTIPART_THRESHOLD:
+            fields = {k: v for k, v in data.items() if k != "data"}
+            files = {"data": (None, payload)}
+        else:
+            fields, files = data, None
+        for attempt in range(1, self.maxlagRetries + 1):
+            R = self._send("POST", data=fields, files=files)
+            if R.status_code != 200:
+                raise Exception(f"POST was unsuccessfull ({R.status_code}): {R.text}")
+            DATA = _loads(R.content)
+            if "error" not in DATA:
+                logging.debug("Post request succeed")
+                return DATA
+            if DATA["error"]["code"] != "maxlag":
                 raise PermissionError("API returned error: " + str(DATA["error"]))
-        logging.debug("Post request succeed")
-        return DATA
+            if attempt == self.maxlagRetries:
+                # Don't wait, if there is no further attempt
+                break
+            sleepfor = float(R.headers.get("retry-after", 5))
+            # Don't keep the old response alive while waiting
+            del R, DATA
+            logging.info("Maxlag hit, waiting for %.1f seconds", sleepfor)
+            time.sleep(sleepfor)
+        raise TimeoutError("Maxlag retries exhausted")
 
     def get(self, data: Dict[str, str]) -> Any:
         """Send a GET request to wikidata
@@ -116,19 +227,22 @@ class WikidataSession:
         :rtype: Any
 
         """
-        R = self.S.get(self.URL, params=data, headers=self.headers)
-        DATA = R.json()
-        if R.status_code != 200 or "error" in DATA:
+        for attempt in range(1, self.maxlagRetries + 1):
+            R = self._send("GET", params=data)
+            DATA = _loads(R.content)
+            if R.status_code == 200 and "error" not in DATA:
+                logging.debug("Get request succeed")
+                return DATA
             # We do not set maxlag for GET requests – so this error can only
             # occur if the users sets maxlag in the request data object
-            if DATA["error"]["code"] == "maxlag":
-                sleepfor = float(R.headers.get("retry-after", 5))
-                logging.info("Maxlag hit, waiting for %.1f seconds", sleepfor)
-                time.sleep(sleepfor)
-                return self.get(data)
-            else:
-                raise Exception(
-                    "GET was unsuccessfull ({}): {}".format(R.status_code, R.text)
-                )
-        logging.debug("Get request succeed")
-        return DATA
+            if DATA.get("error", {}).get("code") != "maxlag":
+                raise Exception(f"GET was unsuccessfull ({R.status_code}): {R.text}")
+            if attempt == self.maxlagRetries:
+                # Don't wait, if there is no further attempt
+                break
+            sleepfor = float(R.headers.get("retry-after", 5))
+            # Don't keep the old response alive while waiting
+            del R, DATA
+            logging.info("Maxlag hit, waiting for %.1f seconds", sleepfor)
+            time.sleep(sleepfor)
+        raise TimeoutError("Maxlag retries exhausted")
@@ -18,5 +18,7 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
+    python_requires=">=3.8",
     install_requires=["requests"],
+    extras_require={"fast": ["orjson", "brotli"], "async": ["aiohttp"]},
 )
@@ -3,6 +3,7 @@ from datetime import datetime
 from pathlib import Path
 
 import pytest
+import requests
 
 import LexData
 
@@ -37,6 +38,47 @@ def test_auth(credentials):
     # LexData.Lexeme(anon, "L2")
 
 
+def test_retries():
+    retry = LexData.WikidataSession().S.get_adapter("https://").max_retries
+    # Edits might already be saved, so they may only be repeated on 429
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("POST", 502)
+    assert retry.is_retry("POST", 429)
+    assert retry.is_retry("GET", 503)
+    assert retry.is_retry("GET", 429)
+
+
+def test_sessionSubclass():
+    class TokenSession(requests.Session):
+        def request(self, method, url, *args, **kwargs):
+            self.requested = True
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{"success": 1}'
+            return response
+
+    session = TokenSession()
+    repo = LexData.WikidataSession(session=session)
+    assert repo.get({"action": "query"}) == {"success": 1}
+    assert session.requested
+
+
+def test_propertyTypeCache(tmp_path, monkeypatch):
+    from LexData import _property_cache
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("LEXDATA_NO_CACHE", raising=False)
+    wikidata = "https://www.wikidata.org/w/api.php"
+    _property_cache.store({wikidata: {"P31": "wikibase-item"}})
+    assert _property_cache.load() == {wikidata: {"P31": "wikibase-item"}}
+    # Entries are kept by wiki, malformed ones are skipped
+    cacheFile = tmp_path / "LexData" / "property_types.json"
+    cacheFile.write_text('{"P7": "string", "%s": {"P1": 5}}' % wikidata)
+    assert _property_cache.load() == {wikidata: {}}
+    monkeypatch.setenv("LEXDATA_NO_CACHE", "1")
+    assert _property_cache.load() == {}
+
+
 def test_lexeme(repo):
     L2 = LexData.Lexeme(repo, "L2")
 
@@ -114,6 +156,13 @@ def test_detatchedClaim(repo):
     LexData.Claim(propertyId="P2534", value="\frac{1}{2}")
     quantity = LexData.Claim(propertyId="P2021", value=6)
     assert quantity.pure_value == 6
+    assert quantity.type == "quantity"
+    assert quantity["mainsnak"]["datavalue"]["type"] == "quantity"
+    assert quantity.value["amount"] == "+6"
+    with pytest.raises(TypeError):
+        LexData.Claim(propertyId="P2021", value=True)
+    with pytest.raises(ValueError):
+        LexData.Claim(propertyId="P2021", value=float("inf"))
     date = LexData.Claim(propertyId="P580", value=datetime.now())
     assert type(date.pure_value) is str
     with pytest.raises(TypeError):